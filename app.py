@@ -1,103 +1,234 @@
 # app.py
 import streamlit as st
 import pandas as pd
-import csv
-from io import StringIO
+import numpy as np
+import dataclasses
+import os
+import pickle
+from io import BytesIO
 
 # --- Configuration ---
 DATA_FILE = "Gantt Chart - KLIA (26 Mar 2025)(Project schedule).csv"
 APP_TITLE = "WBS Progress Tracker - KLIA District Cooling System"
+PARENT_TASK_TYPE = "Parent (Phase)" # Add Task radio label, compared against the selection
+SIDECAR_VERSION = 4 # Bump whenever the pickled WBS layout changes
+_PHASE_PATTERN = r"[Pp][Hh][Aa][Ss][Ee]" # Phase rows start with "phase", any ASCII case
+
+# --- Data Model ---
+
+@dataclasses.dataclass
+class WBS:
+    """Two-level WBS stored as parallel arrays (structure of arrays).
+
+    Children are kept contiguous and grouped by parent in parent order, so
+    `child_parent` is non-decreasing and each parent's children form one slice.
+    """
+    parent_names: list
+    parent_completed: bytearray # 0/1, one per parent
+    parent_expanded: np.ndarray # bool, one per parent
+    parent_done_counts: np.ndarray # int32, completed children per parent
+    child_names: list
+    child_completed: bytearray # 0/1, one per child
+    child_parent: np.ndarray # int32, index of each child's parent
+
+def make_wbs(parent_names, child_names, child_parent):
+    """Builds a WBS with every task incomplete and every parent expanded.
+
+    The name lists are taken over as-is (not copied), so pass finished lists.
+    """
+    return WBS(
+        parent_names=parent_names,
+        parent_completed=bytearray(len(parent_names)),
+        parent_expanded=np.ones(len(parent_names), dtype=bool), # Start expanded
+        parent_done_counts=np.zeros(len(parent_names), dtype=np.int32),
+        child_names=child_names,
+        child_completed=bytearray(len(child_names)),
+        child_parent=np.asarray(child_parent, dtype=np.int32),
+    )
+
+def child_bounds(wbs):
+    """Returns the slice boundaries of every parent's children: parent i owns [bounds[i], bounds[i + 1])."""
+    return np.searchsorted(wbs.child_parent, np.arange(len(wbs.parent_names) + 1))
 
 # --- Helper Functions ---
 
-def parse_csv_to_wbs(csv_content):
-    """Parses the specific CSV structure into a WBS list."""
-    wbs = []
-    current_parent = None
-    parent_index = -1
+def _parse_csv_to_wbs(csv_bytes):
+    """Parses the specific CSV structure (raw UTF-8 bytes) into a WBS.
 
-    # Use StringIO to treat the string content like a file
-    f = StringIO(csv_content)
-    reader = csv.reader(f)
+    Runs inside the cached load pipeline, so it must not emit UI: problems are
+    returned alongside the WBS as (level, message) tuples for the caller to display.
+    """
+    problems = []
 
     try:
-        # Skip header rows until we find the task data structure
-        for _ in range(7): # Skip first 7 rows based on observed format
-             next(reader)
-
-        row_num = 8 # Start counting after skipped rows
-        for row in reader:
-            row_num += 1
-            if not any(field.strip() for field in row):
-                continue # Skip fully blank rows
-
-            task_name = row[1].strip() if len(row) > 1 else ""
-            task_id_indicator = row[0].strip() if len(row) > 0 else ""
-
-            # Identify Parent Task (Phase row)
-            if not task_id_indicator and task_name.lower().startswith("phase"):
-                parent_index += 1
-                current_parent = {
-                    "id": f"p_{parent_index}",
-                    "name": task_name,
-                    "level": 0,
-                    "completed": False,
-                    "expanded": True, # Start expanded
-                    "children": []
-                }
-                wbs.append(current_parent)
-
-            # Identify Child Task
-            elif current_parent and task_name and not task_name.lower().startswith("phase"):
-                 if not (not task_id_indicator and task_name.lower().startswith("phase")):
-                    child_index = len(current_parent["children"])
-                    child_task = {
-                        "id": f"p_{parent_index}_c_{child_index}",
-                        "name": task_name,
-                        "level": 1,
-                        "completed": False,
-                    }
-                    current_parent["children"].append(child_task)
-
-    except StopIteration:
-        st.warning("Reached end of CSV data while parsing.")
+        # Skip the first 7 header rows (observed format); only the ID-indicator and TASK columns matter.
+        # names= fixes the width, so a short first row is padded instead of failing the usecols check.
+        df = pd.read_csv(
+            BytesIO(csv_bytes), skiprows=7, header=None, names=[0, 1], usecols=[0, 1],
+            dtype=str, keep_default_na=False, engine="c", encoding="utf-8",
+        ).fillna("")
+    except pd.errors.EmptyDataError:
+        problems.append(("warning", "Reached end of CSV data while parsing."))
+        return make_wbs([], [], []), problems
     except Exception as e:
-        st.error(f"Error parsing CSV on row {row_num}: {e}")
-        st.error(f"Problematic row data: {row}")
-        return []
-
-    sync_parent_completion(wbs)
+        problems.append(("error", f"Error parsing CSV: {e}"))
+        return make_wbs([], [], []), problems
+
+    # Fully blank rows need no separate filter: with an empty name they are neither phases nor children
+    task_id_indicator = df[0].str.strip()
+    task_name = df[1].str.strip()
+
+    # Parent Task (Phase row): no ID indicator and the name starts with "phase"
+    # Vectorised prefix match; character classes stand in for IGNORECASE, which would also fold non-ASCII letters
+    starts_with_phase = task_name.str.match(_PHASE_PATTERN)
+    is_phase = (task_id_indicator == "") & starts_with_phase
+    # Every row belongs to the most recent phase above it; group 0 is anything before the first phase
+    parent_group = is_phase.cumsum()
+    # Child Task: named, not phase-like, and under some phase
+    is_child = (parent_group > 0) & (task_name != "") & ~starts_with_phase
+
+    # Rows are already in file order, so children come out grouped by parent.
+    # Every task starts incomplete, so parents are already in sync with their
+    # children and no sync_parent_completion pass is needed here.
+    wbs = make_wbs(
+        task_name[is_phase].tolist(),
+        task_name[is_child].tolist(),
+        parent_group[is_child].to_numpy(dtype=np.int32) - 1, # Already int32, so make_wbs does not copy it
+    )
+    return wbs, problems
+
+def _sidecar_wbs(cached, mtime_ns, size):
+    """Returns the WBS from an unpickled sidecar, or None if it was written for another
+    CSV version (mtime, size) or by another data layout."""
+    if not (isinstance(cached, tuple) and len(cached) == 4 and cached[:3] == (SIDECAR_VERSION, mtime_ns, size)):
+        return None
+    wbs = cached[3]
+    # WBS is redefined on every script run, so check the fields rather than isinstance()
+    if not all(hasattr(wbs, field.name) for field in dataclasses.fields(WBS)):
+        return None
+    if not (isinstance(wbs.parent_completed, bytearray) and isinstance(wbs.child_completed, bytearray)):
+        return None # Written when completion was stored as NumPy bool arrays
     return wbs
 
-def sync_parent_completion(wbs_data):
-    """Ensure parent completion status reflects children's status."""
-    for parent in wbs_data:
-        if parent.get("children"):
-            all_children_complete = all(c.get("completed", False) for c in parent["children"])
-            parent["completed"] = all_children_complete
-        else:
-             pass
-
-def calculate_progress(wbs_data):
-    """Calculates overall progress based on completed child tasks."""
-    total_children = 0
-    completed_children = 0
-    for parent in wbs_data:
-        for child in parent.get("children", []):
-            total_children += 1
-            if child.get("completed", False):
-                completed_children += 1
-    return (completed_children / total_children) if total_children > 0 else 0
+@st.cache_resource(show_spinner=False, max_entries=1) # Only the current file version is ever used
+def _load_pipeline(path, mtime_ns, size):
+    """Reads, parses and indexes the CSV once per file version (path, mtime, size).
+
+    The result is shared by every session and must never be mutated; sessions
+    copy only the completion arrays they change (see session_wbs).
+
+    A pickled (SIDECAR_VERSION, mtime_ns, size, WBS) tuple is kept next to the
+    CSV; while it matches the current layout and exactly this file version it
+    is loaded directly and the CSV is not parsed. Exact matching, rather than
+    "sidecar newer than CSV", also catches copies that preserve an older mtime.
+    """
+    wbs, problems = None, []
+    cache_path = path + ".pkl"
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                wbs = _sidecar_wbs(pickle.load(f), mtime_ns, size)
+        except Exception:
+            pass # Unreadable sidecar: fall back to parsing the CSV (and overwrite it)
+
+    if wbs is None:
+        # Read raw bytes and let pandas' C parser decode them, skipping Python's text-mode layer
+        with open(path, 'rb') as f:
+            csv_bytes = f.read()
+        wbs, problems = _parse_csv_to_wbs(csv_bytes)
+
+        if wbs.parent_names and not problems:
+            try:
+                with open(cache_path, 'wb') as f:
+                    pickle.dump((SIDECAR_VERSION, mtime_ns, size, wbs), f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError:
+                pass # Read-only deployment: just parse again next time
+
+    return {"wbs": wbs, "child_bounds": child_bounds(wbs), "problems": problems}
+
+def load_wbs(path):
+    """Returns the shared load pipeline result for `path`, recomputed only when the file changes."""
+    stat = os.stat(path)
+    pipeline = _load_pipeline(path, stat.st_mtime_ns, stat.st_size)
+    for level, message in pipeline["problems"]:
+        getattr(st, level)(message)
+    return pipeline
+
+def session_wbs(shared_wbs):
+    """Gives a session its own WBS: names and structure are shared, completion state is copied.
+
+    Code that adds tasks replaces the shared lists/arrays instead of mutating them.
+    """
+    return dataclasses.replace(
+        shared_wbs,
+        parent_completed=shared_wbs.parent_completed.copy(),
+        parent_expanded=shared_wbs.parent_expanded.copy(),
+        parent_done_counts=shared_wbs.parent_done_counts.copy(),
+        child_completed=shared_wbs.child_completed.copy(),
+    )
+
+def sync_parent_completion(wbs):
+    """Ensure parent completion status reflects children's status.
+
+    Only needed when child states come from somewhere other than a fresh
+    parse (e.g. restored progress); a freshly parsed WBS is all-incomplete.
+    """
+    bounds = child_bounds(wbs)
+    for parent_idx in range(len(wbs.parent_names)):
+        start, end = bounds[parent_idx], bounds[parent_idx + 1]
+        if end == start:
+            continue # Parents without children keep their own state
+        incomplete = wbs.child_completed.count(0, start, end) # One C-level scan of the slice
+        wbs.parent_done_counts[parent_idx] = end - start - incomplete
+        wbs.parent_completed[parent_idx] = incomplete == 0
+
+def calculate_progress(wbs):
+    """Calculates overall progress from the session's completed-children counter."""
+    total = len(wbs.child_completed)
+    return st.session_state.completed_children / total if total else 0.0
+
+def toggle_parent(parent_idx):
+    """Checkbox callback: applies a phase's new state to the phase and all of its children."""
+    wbs = st.session_state.wbs_data
+    bounds = st.session_state.child_bounds
+    start, end = bounds[parent_idx], bounds[parent_idx + 1]
+    parent_completed = st.session_state[f"task_p_{parent_idx}_cb"]
+    done_count = int(end - start) if parent_completed else 0 # Plain int, like the count(1) it adjusts
+    st.session_state.completed_children += done_count - int(wbs.parent_done_counts[parent_idx])
+    wbs.parent_completed[parent_idx] = parent_completed
+    wbs.child_completed[start:end] = bytes([parent_completed]) * (end - start)
+    wbs.parent_done_counts[parent_idx] = done_count
+    for child_idx in range(end - start):
+        st.session_state[f"task_p_{parent_idx}_c_{child_idx}_cb"] = parent_completed # Keep the child widgets in step
+
+def toggle_child(parent_idx, child_idx):
+    """Checkbox callback: records a child's new state and re-syncs its parent's completion."""
+    wbs = st.session_state.wbs_data
+    bounds = st.session_state.child_bounds
+    start, end = bounds[parent_idx], bounds[parent_idx + 1]
+    child_completed = st.session_state[f"task_p_{parent_idx}_c_{child_idx}_cb"]
+    wbs.child_completed[start + child_idx] = child_completed
+    # Adjust the running counts rather than rescanning the parent's (or all) children
+    wbs.parent_done_counts[parent_idx] += 1 if child_completed else -1
+    st.session_state.completed_children += 1 if child_completed else -1
+    wbs.parent_completed[parent_idx] = int(wbs.parent_done_counts[parent_idx] == end - start)
+    st.session_state[f"task_p_{parent_idx}_cb"] = bool(wbs.parent_completed[parent_idx])
+
+def toggle_open(parent_idx):
+    """Button callback: opens or closes a phase's task list."""
+    open_key = f"task_p_{parent_idx}_open"
+    st.session_state[open_key] = not st.session_state[open_key]
 
 def initialize_state():
     """Initializes session state if not already done."""
     if "wbs_data" not in st.session_state:
-        st.session_state.wbs_data = []
+        st.session_state.wbs_data = make_wbs([], [], [])
+        st.session_state.child_bounds = child_bounds(st.session_state.wbs_data)
         try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                csv_content = f.read()
-            st.session_state.wbs_data = parse_csv_to_wbs(csv_content)
-            if not st.session_state.wbs_data:
+            pipeline = load_wbs(DATA_FILE)
+            st.session_state.wbs_data = session_wbs(pipeline["wbs"])
+            st.session_state.child_bounds = pipeline["child_bounds"] # Shared; replaced, never mutated
+            if not st.session_state.wbs_data.parent_names:
                  st.error(f"Could not load or parse data from {DATA_FILE}. Please check the file format.")
 
         except FileNotFoundError:
@@ -105,9 +236,80 @@ def initialize_state():
         except Exception as e:
             st.error(f"An unexpected error occurred loading the data: {e}")
 
+        # Running total for the progress bar, kept in step by the callbacks and Add Task
+        st.session_state.completed_children = st.session_state.wbs_data.child_completed.count(1)
+
     if "show_add_task_form" not in st.session_state:
         st.session_state.show_add_task_form = False
 
+# --- Rendering ---
+
+def render_progress(slot, wbs):
+    """Draws the overall progress bar and metric into `slot`, an st.empty placeholder."""
+    progress_value = calculate_progress(wbs)
+    with slot.container():
+        st.progress(progress_value)
+        st.metric("Overall Progress", f"{progress_value:.1%}")
+
+@st.fragment
+def render_parent(parent_idx, progress_slot):
+    """Renders one phase and its children; reruns on its own when one of its checkboxes changes."""
+    # Read state fresh so a fragment rerun picks up what its own callbacks just changed
+    wbs = st.session_state.wbs_data
+    bounds = st.session_state.child_bounds
+    parent_name = wbs.parent_names[parent_idx]
+    parent_key_base = f"task_p_{parent_idx}"
+
+    # Open/closed state is explicit, so collapsed phases create no checkbox widgets at all
+    open_key = f"{parent_key_base}_open"
+    if open_key not in st.session_state:
+        st.session_state[open_key] = bool(wbs.parent_expanded[parent_idx])
+    is_open = st.session_state[open_key]
+
+    with st.container(border=True):
+        st.button(
+            f"{'▾' if is_open else '▸'} {parent_name}",
+            key=f"{parent_key_base}_toggle",
+            on_click=toggle_open,
+            args=(parent_idx,),
+        )
+
+        if is_open:
+            # --- Parent Checkbox ---
+            # Checkbox state lives under its key and is applied by the on_change callbacks,
+            # so there is no value= here and no explicit st.rerun() afterwards.
+            # Streamlit drops the state of widgets that were not drawn, so re-seed it
+            # from the WBS after the phase has been closed.
+            parent_cb_key = f"{parent_key_base}_cb"
+            if parent_cb_key not in st.session_state:
+                st.session_state[parent_cb_key] = bool(wbs.parent_completed[parent_idx])
+            st.checkbox(
+                f"Complete Phase",
+                key=parent_cb_key,
+                on_change=toggle_parent,
+                args=(parent_idx,),
+                help=f"Mark '{parent_name}' and all sub-tasks as complete."
+            )
+
+            # --- Child Task Checkboxes ---
+            st.markdown("---")
+            start = bounds[parent_idx]
+            for child_idx, child_name in enumerate(wbs.child_names[start:bounds[parent_idx + 1]]):
+                child_cb_key = f"{parent_key_base}_c_{child_idx}_cb"
+                if child_cb_key not in st.session_state:
+                    st.session_state[child_cb_key] = bool(wbs.child_completed[start + child_idx])
+                st.checkbox(
+                    child_name,
+                    key=child_cb_key,
+                    on_change=toggle_child,
+                    args=(parent_idx, child_idx)
+                )
+
+    # A fragment-only rerun skips the main script, so each fragment redraws the shared progress.
+    # It also writes on full runs so the slot is reserved for this fragment's later reruns;
+    # progress comes from a running counter, so each of these draws is O(1).
+    render_progress(progress_slot, wbs)
+
 # --- Main App Logic ---
 st.set_page_config(page_title=APP_TITLE, layout="wide")
 st.title(APP_TITLE)
@@ -115,17 +317,17 @@ st.title(APP_TITLE)
 # Initialize state (loads data on first run)
 initialize_state()
 
-if not isinstance(st.session_state.get("wbs_data"), list):
+# WBS is redefined on every script run, so check the shape rather than isinstance()
+if not hasattr(st.session_state.get("wbs_data"), "child_completed"):
     st.error("WBS data is not loaded correctly. Cannot proceed.")
     st.stop()
 
 # --- Progress Overview ---
-if st.session_state.wbs_data:
-    progress_value = calculate_progress(st.session_state.wbs_data)
-    st.progress(progress_value)
-    st.metric("Overall Progress", f"{progress_value:.1%}")
-else:
-    st.info("No WBS data loaded to display progress.")
+wbs = st.session_state.wbs_data
+
+progress_slot = st.empty() # Filled by the render_parent fragments below
+if not wbs.parent_names:
+    progress_slot.info("No WBS data loaded to display progress.")
 
 st.markdown("---")
 
@@ -137,27 +339,30 @@ if st.session_state.show_add_task_form:
     with st.form("add_task_form"):
         st.subheader("Add New Task")
         new_task_name = st.text_input("Task Name", key="new_task_name_input")
-        new_task_type = st.radio("Task Type", ["Parent (Phase)", "Child"], key="new_task_type_radio")
-
-        parent_options = {p["id"]: p["name"] for p in st.session_state.wbs_data} # Use ID as key
-        selected_parent_id = None
+        new_task_type = st.radio("Task Type", [PARENT_TASK_TYPE, "Child"], key="new_task_type_radio")
+
+        # Reuse the index -> name options across form reruns; rebuilt only when the parent list changes
+        if st.session_state.get("_po_len") != len(wbs.parent_names):
+            st.session_state._parent_options = dict(enumerate(wbs.parent_names)) # Use parent index as key
+            st.session_state._po_len = len(wbs.parent_names)
+        parent_options = st.session_state._parent_options
+        selected_parent_idx = None
         if new_task_type == "Child":
             if not parent_options:
                  st.warning("Cannot add a child task as no parent tasks exist yet.")
-                 target_parent_display = ""
             else:
                 # Ensure parent_options keys are used consistently
-                selected_parent_id = st.selectbox(
+                selected_parent_idx = st.selectbox(
                     "Add Child To Parent:",
                     options=list(parent_options.keys()),
                     format_func=lambda x: parent_options[x],
                     key="target_parent_select"
                 )
 
-        if new_task_type == "Parent":
+        if new_task_type == PARENT_TASK_TYPE:
             st.info("New Parent tasks will be added at the end of the list.")
-        elif new_task_type == "Child" and selected_parent_id:
-             st.info(f"New Child task will be added at the end of '{parent_options[selected_parent_id]}'.")
+        elif new_task_type == "Child" and selected_parent_idx is not None:
+             st.info(f"New Child task will be added at the end of '{parent_options[selected_parent_idx]}'.")
 
 
         submitted = st.form_submit_button("Add Task")
@@ -166,44 +371,36 @@ if st.session_state.show_add_task_form:
             if not new_task_name:
                 st.warning("Please enter a task name.")
             else:
-                if new_task_type == "Parent":
-                    parent_index = len(st.session_state.wbs_data)
-                    new_parent = {
-                        "id": f"p_{parent_index}", # Ensure new ID logic is consistent
-                        "name": new_task_name,
-                        "level": 0,
-                        "completed": False,
-                        "expanded": True,
-                        "children": []
-                    }
-                    st.session_state.wbs_data.append(new_parent)
+                if new_task_type == PARENT_TASK_TYPE:
+                    # Replace rather than mutate: the name lists are shared with other sessions
+                    wbs.parent_names = wbs.parent_names + [new_task_name]
+                    wbs.parent_completed.append(0) # Completion state is already per-session
+                    wbs.parent_expanded = np.append(wbs.parent_expanded, True)
+                    wbs.parent_done_counts = np.append(wbs.parent_done_counts, np.int32(0))
+                    st.session_state.child_bounds = child_bounds(wbs)
+                    st.session_state._po_len = -1 # Invalidate the cached parent options
                     st.success(f"Added Parent: {new_task_name}")
                     st.session_state.show_add_task_form = False
                     st.rerun() # USE st.rerun()
 
                 elif new_task_type == "Child":
-                    if selected_parent_id:
-                        parent_found = False
-                        # Find parent using the selected ID
-                        for i, p in enumerate(st.session_state.wbs_data):
-                             if p["id"] == selected_parent_id:
-                                parent_internal_index = i # Keep track of list index
-                                child_index = len(p["children"])
-                                new_child = {
-                                    # Use the parent's actual list index for child ID generation
-                                    "id": f"{p['id']}_c_{child_index}",
-                                    "name": new_task_name,
-                                    "level": 1,
-                                    "completed": False,
-                                }
-                                # Modify the list directly using the found index
-                                st.session_state.wbs_data[parent_internal_index]["children"].append(new_child)
-                                st.session_state.wbs_data[parent_internal_index]["completed"] = False
-                                st.success(f"Added Child '{new_task_name}' to Parent '{p['name']}'")
-                                parent_found = True
-                                break
-                        if not parent_found:
-                             st.error("Selected parent ID not found. Cannot add child.") # Error if ID mismatch
+                    if selected_parent_idx is not None:
+                        if selected_parent_idx < len(wbs.parent_names):
+                            parent_internal_index = selected_parent_idx
+                            bounds = st.session_state.child_bounds
+                            # Insert at the end of this parent's slice so children stay grouped by parent
+                            insert_at = int(bounds[parent_internal_index + 1])
+                            # Replace rather than mutate: the name list is shared with other sessions
+                            wbs.child_names = wbs.child_names[:insert_at] + [new_task_name] + wbs.child_names[insert_at:]
+                            wbs.child_completed.insert(insert_at, 0) # Completion state is already per-session
+                            # New child is incomplete: completed_children is unchanged, only the total grows
+                            wbs.child_parent = np.insert(wbs.child_parent, insert_at, parent_internal_index)
+                            wbs.parent_completed[parent_internal_index] = 0
+                            st.session_state.child_bounds = child_bounds(wbs)
+                            st.session_state[f"task_p_{parent_internal_index}_cb"] = False
+                            st.success(f"Added Child '{new_task_name}' to Parent '{wbs.parent_names[parent_internal_index]}'")
+                        else:
+                             st.error("Selected parent not found. Cannot add child.") # Error if index is stale
 
                         st.session_state.show_add_task_form = False
                         st.rerun() # USE st.rerun()
@@ -214,98 +411,16 @@ if st.session_state.show_add_task_form:
     st.markdown("---")
 
 # --- WBS Display and Interaction ---
-if not st.session_state.wbs_data:
+if not wbs.parent_names:
     st.info("Upload or parse a CSV file to see the WBS.")
 else:
-    # No need for wbs_changed flag if we use st.rerun() immediately on change
-    current_wbs = st.session_state.wbs_data
-
-    for parent_idx, parent_task in enumerate(current_wbs):
-        parent_id = parent_task['id']
-        parent_key_base = f"task_{parent_id}"
-
-        # Retrieve expanded state from session state, default to True if not found
-        is_expanded = st.session_state.get(f"{parent_key_base}_expanded", parent_task.get("expanded", True))
-
-        # Use a callback to store the expander state
-        def expander_changed(key, value):
-            st.session_state[key] = value
-
-        # Note: Streamlit expander doesn't have a direct on_change for expand/collapse state easily accessible without complex workarounds.
-        # We will manage state more manually. Let's assume we want to store the *last known* state.
-        # A simpler approach: Store state only when *interacting* with checkboxes inside.
-
-        with st.expander(f"{parent_task['name']}", expanded=is_expanded):
-             # When it's rendered expanded, ensure the state reflects this
-             st.session_state[f"{parent_key_base}_expanded"] = True
-
-             # --- Parent Checkbox ---
-             parent_completed_value = parent_task.get("completed", False)
-             parent_completed_interaction = st.checkbox(
-                 f"Complete Phase",
-                 value=parent_completed_value,
-                 key=f"{parent_key_base}_cb",
-                 help=f"Mark '{parent_task['name']}' and all sub-tasks as complete."
-             )
-
-             if parent_completed_interaction != parent_completed_value:
-                 parent_task["completed"] = parent_completed_interaction
-                 for child_task in parent_task.get("children", []):
-                     child_task["completed"] = parent_completed_interaction
-                 # Store expanded state on interaction
-                 st.session_state[f"{parent_key_base}_expanded"] = True
-                 st.rerun() # USE st.rerun()
-
-             # --- Child Task Checkboxes ---
-             st.markdown("---")
-             children_changed_in_loop = False
-             all_children_now_complete_in_loop = True if parent_task.get("children") else False
-
-             for child_idx, child_task in enumerate(parent_task.get("children", [])):
-                 child_id = child_task['id']
-                 child_key = f"task_{child_id}_cb"
-                 child_completed_value = child_task.get("completed", False)
-
-                 child_completed_interaction = st.checkbox(
-                     child_task['name'],
-                     value=child_completed_value,
-                     key=child_key
-                 )
-
-                 if child_completed_interaction != child_completed_value:
-                     child_task["completed"] = child_completed_interaction
-                     children_changed_in_loop = True
-
-                 if not child_task["completed"]:
-                     all_children_now_complete_in_loop = False
-
-             # --- Sync Parent state based on Children AFTER looping through all children ---
-             if children_changed_in_loop:
-                 new_parent_state = all_children_now_complete_in_loop
-                 if parent_task.get("completed") != new_parent_state:
-                     parent_task["completed"] = new_parent_state
-                 # Store expanded state on interaction
-                 st.session_state[f"{parent_key_base}_expanded"] = True
-                 st.rerun() # USE st.rerun() - Rerun if any child change occurred
-
-        # Heuristic to try and capture collapsed state: If the key exists but wasn't set to True during render, assume it was collapsed.
-        # This is imperfect. A better way might involve JS hacks or structuring differently.
-        # Let's remove this complexity for now and let expanders reopen if state isn't actively managed on collapse.
-        # if f"{parent_key_base}_expanded" in st.session_state and not st.session_state[f"{parent_key_base}_expanded"]:
-        #     # If state exists and wasn't marked True this run, it must have been collapsed by user
-        #      parent_task["expanded"] = False
-        # else:
-        #      # Otherwise assume expanded or keep previous state if available
-        #      parent_task["expanded"] = True
-        # # Reset the transient flag for the next run
-        # if f"{parent_key_base}_expanded" in st.session_state:
-        #      st.session_state[f"{parent_key_base}_expanded"] = parent_task["expanded"]
-
-
-    # Persist potentially modified WBS data back (though direct dict modification often updates session_state)
-    # st.session_state.wbs_data = current_wbs # Redundant if modifying dicts within list directly
+    for parent_idx in range(len(wbs.parent_names)):
+        render_parent(parent_idx, progress_slot)
+
+    # Persist potentially modified WBS data back (though in-place array edits already update session_state)
+    # st.session_state.wbs_data = wbs # Redundant since the WBS object itself lives in session_state
 
 
 # --- Display Raw Data (Optional Debugging) ---
 # with st.expander("Show Raw WBS Data"):
-#    st.json(st.session_state.wbs_data)
\ No newline at end of file
+#    st.write(st.session_state.wbs_data)
\ No newline at end of file